@@ -1,12 +1,17 @@
 import sys
+import threading
 import requests
+from functools import lru_cache
 
-from .config_param import config_param
+from .config_param import config_param, _load_config
 
 _BB_HOST = config_param("host")
 _BB_PORT = config_param("port")
 _BB_API_VERSION = config_param("api_version")
 
+# holds one requests.Session per thread, see _session()
+_THREAD_LOCAL = threading.local()
+
 
 def bluebird_config(
     host=config_param("host"),
@@ -31,9 +36,36 @@ def bluebird_config(
     setattr(this_module, "_BB_HOST", host)
     setattr(this_module, "_BB_PORT", port)
     setattr(this_module, "_BB_API_VERSION", version)
+    _invalidate()
     return True
 
 
+def _invalidate():
+    """
+    Clear the cached BlueBird URLs and config files, e.g. after the BlueBird
+    config changed. The config files are read again when next used.
+    """
+    _load_config.cache_clear()
+    get_bluebird_url.cache_clear()
+    construct_endpoint_url.cache_clear()
+
+
+def _session():
+    """
+    Get the requests.Session used for BlueBird calls made from this thread.
+
+    The session pools (keep-alive) connections, so repeated calls do not open a
+    new connection each time. Each thread gets its own session, as
+    requests.Session is not guaranteed to be thread-safe.
+    """
+    session = getattr(_THREAD_LOCAL, "session", None)
+    if session is None:
+        session = requests.Session()
+        _THREAD_LOCAL.session = session
+    return session
+
+
+@lru_cache(maxsize=None)
 def get_bluebird_url():
     """
     Get the URL of the BlueBird API.
@@ -59,6 +91,7 @@ def get_bluebird_url():
     )
 
 
+@lru_cache(maxsize=None)
 def construct_endpoint_url(endpoint):
     """
     Construct a BlueBird endpoint URL.
@@ -108,7 +141,7 @@ def ping_bluebird():
     # /pos endpoint only supports GET requests, this should return an error if BlueBird is running
     # on the specified host
     try:
-        resp = requests.post(url)
+        resp = _session().post(url)
     except requests.exceptions.ConnectionError as e:
         print(e)
         return False
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from os.path import abspath, dirname, join, exists
 import yaml
 
@@ -25,6 +26,13 @@ def find_config(config_filename):
     return cfg_file
 
 
+@lru_cache(maxsize=None)
+def _load_config(cfg_file):
+    """Read and parse a configuration file. Each file is only read once."""
+    with open(cfg_file) as ymlfile:
+        return yaml.safe_load(ymlfile)
+
+
 def config_param(param, config="default", cfg_file=find_config("config.yml")):
     """
     Get a configuration parameter.
@@ -43,8 +51,7 @@ def config_param(param, config="default", cfg_file=find_config("config.yml")):
     The value of the requested configuration parameter. An error is thrown if
     the given parameter name is not found in the config file.
     """
-    with open(cfg_file) as ymlfile:
-        cfg = yaml.safe_load(ymlfile)
+    cfg = _load_config(cfg_file)
 
     assert param in cfg[config], "Config parameter {} not found".format(param)
 
@@ -1,7 +1,8 @@
 import pandas as pd
 import numpy as np
 from geopy import distance
-from scipy.spatial.distance import euclidean
+from pyproj import Geod
+from scipy.spatial import cKDTree
 
 from .config_param import config_param
 from .request_position import aircraft_position
@@ -11,6 +12,17 @@ from . import utils
 major_semiaxis, minor_semiaxis, _FLATTENING = distance.ELLIPSOIDS["WGS-84"]
 _EARTH_RADIUS = major_semiaxis * 1000  # convert to metres
 
+# pyproj.Geod instances keyed by (major_semiaxis, flattening)
+_GEOD_CACHE = {}
+
+
+def _get_geod(major_semiaxis, flattening):
+    """Get a (cached) pyproj.Geod for an ellipsoid, major_semiaxis in metres."""
+    key = (major_semiaxis, flattening)
+    if key not in _GEOD_CACHE:
+        _GEOD_CACHE[key] = Geod(a=major_semiaxis, f=flattening)
+    return _GEOD_CACHE[key]
+
 
 def geodesic_distance(from_lat, from_lon, to_lat, to_lon, **kwargs):
     """
@@ -18,14 +30,14 @@ def geodesic_distance(from_lat, from_lon, to_lat, to_lon, **kwargs):
 
     Parameters
     ----------
-    from_lat : double
-        A double in the range ``[-90, 90]``. The `from` point's latitude.
-    from_lon : double
-        A double in the range ``[-180, 180)``. The `from` point's longitude.
-    to_lat : double
-        A double in the range ``[-90, 90]``. The `to` point's latitude.
-    to_lon : double
-        A double in the range ``[-180, 180)``. The `to` point's longitude.
+    from_lat : double or array
+        A double or array in the range ``[-90, 90]``. The `from` point's latitude.
+    from_lon : double or array
+        A double or array in the range ``[-180, 180)``. The `from` point's longitude.
+    to_lat : double or array
+        A double or array in the range ``[-90, 90]``. The `to` point's latitude.
+    to_lon : double or array
+        A double or array in the range ``[-180, 180)``. The `to` point's longitude.
     **kwargs:
         major_semiaxis : double, optional
             The major (equatorial) radius of the ellipsoid. The default value is for WGS84.
@@ -34,8 +46,9 @@ def geodesic_distance(from_lat, from_lon, to_lat, to_lon, **kwargs):
 
     Returns
     -------
-    geodesic_distance : double
-        The geodesic distance between two points.
+    geodesic_distance : double or array
+        The geodesic distance between two points, or an array of distances for
+        array inputs. Array inputs are broadcast together.
 
     Examples
     --------
@@ -53,13 +66,67 @@ def geodesic_distance(from_lat, from_lon, to_lat, to_lon, **kwargs):
     utils._validate_is_positive(major_semiaxis, "major_semiaxis")
     utils._validate_is_positive(flattening, "flattening")
 
-    # For GeoPy need to provide (major_semiaxis, minor_semiaxis, flattening) but
-    # only major_semiaxis & flattening vals are used --> ignore minor_semiaxis
-    return distance.geodesic(
-        (from_lat, from_lon),
-        (to_lat, to_lon),
-        ellipsoid=(major_semiaxis / 1000, minor_semiaxis, flattening),  # convert to km
-    ).meters
+    return _geodesic_unchecked(
+        from_lat,
+        from_lon,
+        to_lat,
+        to_lon,
+        major_semiaxis=major_semiaxis,
+        flattening=flattening,
+    )
+
+
+def _geodesic_unchecked(
+    from_lat,
+    from_lon,
+    to_lat,
+    to_lon,
+    major_semiaxis=_EARTH_RADIUS,
+    flattening=_FLATTENING,
+    **kwargs
+):
+    """
+    ``geodesic_distance`` without input validation, i.e. the degrees variant
+    of ``_geodesic_rad``.
+    """
+    return _geodesic_rad(
+        np.deg2rad(from_lat),
+        np.deg2rad(from_lon),
+        np.deg2rad(to_lat),
+        np.deg2rad(to_lon),
+        major_semiaxis=major_semiaxis,
+        flattening=flattening,
+    )
+
+
+def _geodesic_rad(
+    from_lat_r,
+    from_lon_r,
+    to_lat_r,
+    to_lon_r,
+    major_semiaxis=_EARTH_RADIUS,
+    flattening=_FLATTENING,
+    **kwargs
+):
+    """
+    Geodesic distance in metres with (lat, lon) in radians. Inputs can be any
+    arrays that broadcast together.
+    """
+    from_lat_r, from_lon_r, to_lat_r, to_lon_r = np.broadcast_arrays(
+        from_lat_r, from_lon_r, to_lat_r, to_lon_r
+    )
+
+    # pyproj solves all the (flattened) pairs in a single call
+    geod = _get_geod(major_semiaxis, flattening)
+    _, _, dist = geod.inv(
+        from_lon_r.ravel(),
+        from_lat_r.ravel(),
+        to_lon_r.ravel(),
+        to_lat_r.ravel(),
+        radians=True,
+    )
+    # [()] unwraps a 0-d result to a scalar and leaves other arrays unchanged
+    return dist.reshape(from_lat_r.shape)[()]
 
 
 def great_circle_distance(from_lat, from_lon, to_lat, to_lon, **kwargs):
@@ -68,22 +135,23 @@ def great_circle_distance(from_lat, from_lon, to_lat, to_lon, **kwargs):
 
     Parameters
     ----------
-    from_lat : double
-        A double in the range ``[-90, 90]``. The `from` point's latitude.
-    from_lon : double
-        A double in the range ``[-180, 180)``. The `from` point's longitude.
-    to_lat : double
-        A double in the range ``[-90, 90]``. The `to` point's latitude.
-    to_lon : double
-        A double in the range ``[-180, 180)``. The `to` point's longitude.
+    from_lat : double or array
+        A double or array in the range ``[-90, 90]``. The `from` point's latitude.
+    from_lon : double or array
+        A double or array in the range ``[-180, 180)``. The `from` point's longitude.
+    to_lat : double or array
+        A double or array in the range ``[-90, 90]``. The `to` point's latitude.
+    to_lon : double or array
+        A double or array in the range ``[-180, 180)``. The `to` point's longitude.
     **kwargs
         radius : double, optional
             The radius of the earth in metres. The default value is for WGS84.
 
     Returns
     -------
-    great_circle_distance : double
-        The great-circle distance between two points.
+    great_circle_distance : double or array
+        The great-circle distance between two points, or an array of distances for
+        array inputs. Array inputs are broadcast together.
 
     Examples
     --------
@@ -97,9 +165,65 @@ def great_circle_distance(from_lat, from_lon, to_lat, to_lon, **kwargs):
     utils._validate_longitude(to_lon)
     utils._validate_is_positive(radius, "radius")
 
-    return distance.great_circle(
-        (from_lat, from_lon), (to_lat, to_lon), radius=radius / 1000  # convert to km
-    ).meters
+    return _great_circle_unchecked(from_lat, from_lon, to_lat, to_lon, radius=radius)
+
+
+def _haversine(
+    from_lat_r,
+    from_lon_r,
+    to_lat_r,
+    to_lon_r,
+    radius=_EARTH_RADIUS,
+    from_cos_lat=None,
+    to_cos_lat=None,
+    **kwargs
+):
+    """
+    Great-circle distance in metres using the haversine formula, with
+    (lat, lon) in radians. Inputs can be any arrays that broadcast together.
+    The cosines of the latitudes are computed unless given.
+    """
+    if from_cos_lat is None:
+        from_cos_lat = np.cos(from_lat_r)
+    if to_cos_lat is None:
+        to_cos_lat = np.cos(to_lat_r)
+
+    # Evaluated in place so that only two arrays of the broadcast shape are
+    # allocated, rather than a new temporary for every operation.
+    a = np.asarray(np.subtract(from_lon_r, to_lon_r))
+    a /= 2
+    np.sin(a, out=a)
+    a *= a
+    np.multiply(a, from_cos_lat, out=a)
+    np.multiply(a, to_cos_lat, out=a)
+
+    dlat = np.asarray(np.subtract(from_lat_r, to_lat_r))
+    dlat /= 2
+    np.sin(dlat, out=dlat)
+    dlat *= dlat
+    a += dlat
+
+    np.sqrt(a, out=a)
+    np.arcsin(a, out=a)
+    a *= 2 * radius
+    # [()] unwraps a 0-d result to a scalar and leaves other arrays unchanged
+    return a[()]
+
+
+def _great_circle_unchecked(
+    from_lat, from_lon, to_lat, to_lon, radius=_EARTH_RADIUS, **kwargs
+):
+    """
+    ``great_circle_distance`` without input validation, i.e. the degrees variant
+    of ``_haversine``.
+    """
+    return _haversine(
+        np.deg2rad(from_lat),
+        np.deg2rad(from_lon),
+        np.deg2rad(to_lat),
+        np.deg2rad(to_lon),
+        radius,
+    )
 
 
 def vertical_distance(from_alt, to_alt, **kwargs):
@@ -108,15 +232,16 @@ def vertical_distance(from_alt, to_alt, **kwargs):
 
     Parameters
     ----------
-    from_alt : double
-        A non-negatige double. The `from` point's altitude in metres.
-    to_alt : double
-        A non-negatige double. The `to` point's altitude in metres.
+    from_alt : double or array
+        A non-negatige double or array. The `from` point's altitude in metres.
+    to_alt : double or array
+        A non-negatige double or array. The `to` point's altitude in metres.
 
     Returns
     -------
-    vertical_distance : double
-        The verticle distance between two points.
+    vertical_distance : double or array
+        The verticle distance between two points, or an array of distances for
+        array inputs. Array inputs are broadcast together.
 
     Examples
     --------
@@ -125,6 +250,14 @@ def vertical_distance(from_alt, to_alt, **kwargs):
     utils._validate_is_positive(from_alt, "altitude")
     utils._validate_is_positive(to_alt, "altitude")
 
+    return _vertical_unchecked(from_alt, to_alt)
+
+
+def _vertical_unchecked(from_alt, to_alt, **kwargs):
+    """
+    ``vertical_distance`` without input validation. Inputs can be any arrays
+    that broadcast together.
+    """
     return abs(from_alt - to_alt)
 
 
@@ -160,15 +293,27 @@ def _lla_to_ECEF(lat, lon, alt=0, radius=_EARTH_RADIUS, f=_FLATTENING):
     >>> pydodo.distance_measures.lla_to_ECEF(lat = 51.5 , lon = 0.12, alt = 200)
     """
 
-    lat_r = np.deg2rad(lat)
-    lon_r = np.deg2rad(lon)
+    return _lla_to_ECEF_rad(np.deg2rad(lat), np.deg2rad(lon), alt, radius, f)
+
+
+def _lla_to_ECEF_rad(
+    lat_r, lon_r, alt=0, radius=_EARTH_RADIUS, f=_FLATTENING, cos_lat=None, sin_lat=None
+):
+    """
+    Radians variant of ``_lla_to_ECEF``. The cosine and sine of the latitude
+    are computed unless given.
+    """
+    if cos_lat is None:
+        cos_lat = np.cos(lat_r)
+    if sin_lat is None:
+        sin_lat = np.sin(lat_r)
 
     e2 = 1 - (1 - f) * (1 - f)
-    N = radius / np.sqrt(1 - e2 * np.power(np.sin(lat_r), 2))
+    N = radius / np.sqrt(1 - e2 * np.power(sin_lat, 2))
 
-    x = (N + alt) * np.cos(lat_r) * np.cos(lon_r)
-    y = (N + alt) * np.cos(lat_r) * np.sin(lon_r)
-    z = ((1 - e2) * N + alt) * np.sin(lat_r)
+    x = (N + alt) * cos_lat * np.cos(lon_r)
+    y = (N + alt) * cos_lat * np.sin(lon_r)
+    z = ((1 - e2) * N + alt) * sin_lat
 
     return (x, y, z)
 
@@ -180,18 +325,18 @@ def euclidean_distance(from_lat, from_lon, from_alt, to_lat, to_lon, to_alt, **k
 
     Parameters
     ----------
-    from_lat : double
-        A double in the range ``[-90, 90]``. The `from` point's latitude.
-    from_lon : double
-        A double in the range ``[-180, 180)``. The `from` point's longitude.
-    from_alt : double
-        A non-negatige double. The from point's altitude in metres.
-    to_lat : double
-         A double in the range ``[-90, 90]``. The `to` point's latitude.
-    to_lon : double
-        A double in the range ``[-180, 180)``. The `to` point's longitude.
-    to_alt : double
-        A non-negatige double. The `to` point's altitude in metres.
+    from_lat : double or array
+        A double or array in the range ``[-90, 90]``. The `from` point's latitude.
+    from_lon : double or array
+        A double or array in the range ``[-180, 180)``. The `from` point's longitude.
+    from_alt : double or array
+        A non-negatige double or array. The from point's altitude in metres.
+    to_lat : double or array
+         A double or array in the range ``[-90, 90]``. The `to` point's latitude.
+    to_lon : double or array
+        A double or array in the range ``[-180, 180)``. The `to` point's longitude.
+    to_alt : double or array
+        A non-negatige double or array. The `to` point's altitude in metres.
     **kwargs:
         major_semiaxis : double, optional
             The major (equatorial) radius of the ellipsoid. The default value is for WGS84.
@@ -200,8 +345,9 @@ def euclidean_distance(from_lat, from_lon, from_alt, to_lat, to_lon, to_alt, **k
 
     Returns
     -------
-    euclidean_distance : double
-        The euclidean distance between two points.
+    euclidean_distance : double or array
+        The euclidean distance between two points, or an array of distances for
+        array inputs. Array inputs are broadcast together.
 
     Notes
     -----
@@ -224,13 +370,91 @@ def euclidean_distance(from_lat, from_lon, from_alt, to_lat, to_lon, to_alt, **k
     utils._validate_is_positive(to_alt, "altitude")
     utils._validate_is_positive(major_semiaxis, " major_semiaxis")
 
-    from_ECEF = _lla_to_ECEF(from_lat, from_lon, from_alt, major_semiaxis, flattening)
-    to_ECEF = _lla_to_ECEF(to_lat, to_lon, to_alt, major_semiaxis, flattening)
+    return _euclidean_unchecked(
+        from_lat,
+        from_lon,
+        from_alt,
+        to_lat,
+        to_lon,
+        to_alt,
+        major_semiaxis=major_semiaxis,
+        flattening=flattening,
+    )
+
 
-    return euclidean(from_ECEF, to_ECEF)
+def _euclidean_unchecked(
+    from_lat,
+    from_lon,
+    from_alt,
+    to_lat,
+    to_lon,
+    to_alt,
+    major_semiaxis=_EARTH_RADIUS,
+    flattening=_FLATTENING,
+    **kwargs
+):
+    """
+    ``euclidean_distance`` without input validation, i.e. the degrees variant
+    of ``_euclidean_rad``.
+    """
+    return _euclidean_rad(
+        np.deg2rad(from_lat),
+        np.deg2rad(from_lon),
+        from_alt,
+        np.deg2rad(to_lat),
+        np.deg2rad(to_lon),
+        to_alt,
+        major_semiaxis=major_semiaxis,
+        flattening=flattening,
+    )
+
+
+def _euclidean_rad(
+    from_lat_r,
+    from_lon_r,
+    from_alt,
+    to_lat_r,
+    to_lon_r,
+    to_alt,
+    major_semiaxis=_EARTH_RADIUS,
+    flattening=_FLATTENING,
+    from_cos_lat=None,
+    from_sin_lat=None,
+    to_cos_lat=None,
+    to_sin_lat=None,
+    **kwargs
+):
+    """
+    Euclidean distance in metres between the ECEF coordinates of two points,
+    with (lat, lon) in radians. Inputs can be any arrays that broadcast
+    together. The cosines and sines of the latitudes are computed unless given.
+    """
+    from_x, from_y, from_z = _lla_to_ECEF_rad(
+        from_lat_r,
+        from_lon_r,
+        from_alt,
+        major_semiaxis,
+        flattening,
+        cos_lat=from_cos_lat,
+        sin_lat=from_sin_lat,
+    )
+    to_x, to_y, to_z = _lla_to_ECEF_rad(
+        to_lat_r,
+        to_lon_r,
+        to_alt,
+        major_semiaxis,
+        flattening,
+        cos_lat=to_cos_lat,
+        sin_lat=to_sin_lat,
+    )
+
+    dx = from_x - to_x
+    dy = from_y - to_y
+    dz = from_z - to_z
+    return np.sqrt(dx * dx + dy * dy + dz * dz)
 
 
-def _get_pos_df(from_aircraft_id, to_aircraft_id):
+def _get_pos_arrays(from_aircraft_id, to_aircraft_id):
     """
     Get position for all unique aircraft listed in from_aircraft_id & to_aircraft_id.
 
@@ -243,26 +467,236 @@ def _get_pos_df(from_aircraft_id, to_aircraft_id):
 
     Returns
     -------
-    pos_df : pandas.DataFrame
-       A dataframe of current positions (aircraft_id are row indexes) with
-       altitude in metres. All row values are NaN if requested aircraft ID does not exist.
+    pos : dict
+       A dictionary of current positions with keys:
+    | - ``lat``: A float64 array of latitudes.
+    | - ``lon``: A float64 array of longitudes.
+    | - ``alt``: A float64 array of altitudes in metres.
+    | - ``lat_r``, ``lon_r``: Float64 arrays of latitudes and longitudes in radians.
+    | - ``cos_lat``, ``sin_lat``: Float64 arrays of the cosine and sine of the latitudes.
+    | - ``idx``: A dictionary mapping each aircraft ID to its position in the arrays.
+    | - ``missing``: A boolean array, True where any position value is missing
+        (including aircraft IDs that do not exist).
 
     Examples
     --------
-    >>> pydodo.distance_measures.get_pos_df(from_aircraft_id = ["BAW123"], to_aircraft_id = ["KLM456"])
+    >>> pydodo.distance_measures._get_pos_arrays(from_aircraft_id = ["BAW123"], to_aircraft_id = ["KLM456"])
     """
 
     utils._validate_id_list(from_aircraft_id)
     utils._validate_id_list(to_aircraft_id)
 
-    ids = list(set(from_aircraft_id + to_aircraft_id))
+    # ordered de-duplication
+    ids = list(dict.fromkeys(from_aircraft_id + to_aircraft_id))
     pos_df = aircraft_position(ids)
     SCALE_FEET_TO_METRES = 0.3048
-    pos_df.loc[:, "current_flight_level"] = SCALE_FEET_TO_METRES * pos_df["current_flight_level"]
-    return pos_df
 
+    pos_arr = pos_df[["latitude", "longitude", "current_flight_level"]].to_numpy(
+        dtype=float
+    )
+    lat = np.ascontiguousarray(pos_arr[:, 0])
+    lon = np.ascontiguousarray(pos_arr[:, 1])
+    lat_r = np.deg2rad(lat)
+    return {
+        "lat": lat,
+        "lon": lon,
+        # the product is a new contiguous array, the dataframe is left unchanged
+        "alt": SCALE_FEET_TO_METRES * pos_arr[:, 2],
+        "lat_r": lat_r,
+        "lon_r": np.deg2rad(lon),
+        "cos_lat": np.cos(lat_r),
+        "sin_lat": np.sin(lat_r),
+        "idx": {aircraft: i for i, aircraft in enumerate(ids)},
+        "missing": np.isnan(pos_arr).any(axis=1),
+    }
+
+
+def _euclidean_outer(
+    from_lat_r,
+    from_lon_r,
+    from_alt,
+    from_cos_lat,
+    from_sin_lat,
+    to_lat_r,
+    to_lon_r,
+    to_alt,
+    to_cos_lat,
+    to_sin_lat,
+    major_semiaxis=_EARTH_RADIUS,
+    flattening=_FLATTENING,
+    **kwargs
+):
+    """
+    Euclidean distance in metres between the ECEF coordinates of every "from"
+    and every "to" point, with (lat, lon) in radians. The "from" inputs are
+    column vectors (N x 1) and the "to" inputs are row vectors (1 x M).
+
+    Uses ``|x - y|^2 = |x|^2 + |y|^2 - 2 x.y``, so that the ECEF coordinates
+    are computed once per point and the pairwise work is a single
+    (N x 3) @ (3 x M) matrix product.
+    """
+    # (N x 1) columns are joined into N x 3, (1 x M) rows into 3 x M
+    from_xyz = np.hstack(
+        _lla_to_ECEF_rad(
+            from_lat_r,
+            from_lon_r,
+            from_alt,
+            major_semiaxis,
+            flattening,
+            cos_lat=from_cos_lat,
+            sin_lat=from_sin_lat,
+        )
+    )
+    to_xyz_T = np.vstack(
+        _lla_to_ECEF_rad(
+            to_lat_r,
+            to_lon_r,
+            to_alt,
+            major_semiaxis,
+            flattening,
+            cos_lat=to_cos_lat,
+            sin_lat=to_sin_lat,
+        )
+    )
+    # Centring the coordinates limits the cancellation error of the identity
+    # above. Missing (NaN) points only give NaN distances in their row/column.
+    all_xyz = np.vstack([from_xyz, to_xyz_T.T])
+    found = ~np.isnan(all_xyz).any(axis=1)
+    if found.any():
+        centre = all_xyz[found].mean(axis=0)
+        from_xyz -= centre
+        to_xyz_T -= centre[:, None]
+
+    dist = from_xyz @ to_xyz_T
+    dist *= -2
+    dist += (from_xyz * from_xyz).sum(axis=1)[:, None]
+    dist += (to_xyz_T * to_xyz_T).sum(axis=0)[None, :]
+    np.maximum(dist, 0, out=dist)
+    np.sqrt(dist, out=dist)
+    # exact zero rather than rounding error between identical points, comparing
+    # one coordinate at a time so that only an N x M mask is allocated
+    same = from_xyz[:, 0:1] == to_xyz_T[0:1, :]
+    for k in [1, 2]:
+        same &= from_xyz[:, k : k + 1] == to_xyz_T[k : k + 1, :]
+    dist[same] = 0
+    return dist
+
+
+# Separation kernels (without input validation) keyed by measure, with the
+# _get_pos_arrays fields each kernel takes for the "from" and "to" aircraft,
+# and whether a self-separation is computed from the upper triangle of pairs
+# only. Vertical and great circle distances are too cheap for the triangle
+# indexing to pay off, and euclidean distance uses a matrix product over all
+# pairs instead.
+_DISPATCH = {
+    "geodesic": (_geodesic_rad, ("lat_r", "lon_r"), True),
+    "great_circle": (_haversine, ("lat_r", "lon_r", "cos_lat"), False),
+    "vertical": (_vertical_unchecked, ("alt",), False),
+    "euclidean": (
+        _euclidean_outer,
+        ("lat_r", "lon_r", "alt", "cos_lat", "sin_lat"),
+        False,
+    ),
+}
+
+
+def _pair_distances(pos, fields, from_idx, to_idx, kernel, **kwargs):
+    """
+    Apply a separation kernel to the positions at from_idx and to_idx, two
+    index arrays into the ``_get_pos_arrays`` arrays that broadcast together.
+    Only the given position fields are gathered and passed to the kernel, as
+    ``from_<field>`` and ``to_<field>``.
+    """
+    args = {}
+    for field in fields:
+        args["from_" + field] = pos[field][from_idx]
+        args["to_" + field] = pos[field][to_idx]
+    return kernel(**args, **kwargs)
 
-def _get_separation(from_aircraft_id, to_aircraft_id, distance_f, **kwargs):
+
+def _cartesian(pos, idx, measure, major_semiaxis, radius, flattening):
+    """
+    Cartesian coordinates of the positions at idx for a spatial index of the
+    given measure. The straight line distance between two points is never
+    more than their separation: the chord of the sphere or ellipsoid is at
+    most the great circle or geodesic arc, and the euclidean and vertical
+    coordinates are exact.
+    """
+    if measure == "vertical":
+        return pos["alt"][idx][:, None].astype(np.float64)
+
+    if measure == "great_circle":
+        xyz = _lla_to_ECEF_rad(
+            pos["lat_r"][idx],
+            pos["lon_r"][idx],
+            radius=radius,
+            f=0,
+            cos_lat=pos["cos_lat"][idx],
+            sin_lat=pos["sin_lat"][idx],
+        )
+    else:
+        # geodesic separation is bounded by the chord of the ellipsoid surface
+        alt = pos["alt"][idx] if measure == "euclidean" else 0
+        xyz = _lla_to_ECEF_rad(
+            pos["lat_r"][idx],
+            pos["lon_r"][idx],
+            alt,
+            radius=major_semiaxis,
+            f=flattening,
+            cos_lat=pos["cos_lat"][idx],
+            sin_lat=pos["sin_lat"][idx],
+        )
+    return np.column_stack(xyz).astype(np.float64)
+
+
+def _near_separation(
+    pos, from_idx, to_idx, measure, max_distance, dtype, upper=False, **kwargs
+):
+    """
+    Separation of the pairs of positions at from_idx and to_idx that are at
+    most max_distance apart, as arrays (i, j, dist) of indices into from_idx
+    and to_idx and their separation, sorted by i then j. With upper, from_idx
+    and to_idx are the same and only the pairs with i < j are returned.
+
+    Candidate pairs are found with k-d trees of the cartesian coordinates, so
+    only those pairs are computed rather than all N x M of them, with the same
+    kernels as the dense separation matrix. Separations at the threshold can
+    still be rounded differently to the matrix. Positions that are missing
+    are never paired.
+    """
+    from_found = np.flatnonzero(~pos["missing"][from_idx])
+    to_found = np.flatnonzero(~pos["missing"][to_idx])
+
+    from_tree = cKDTree(_cartesian(pos, from_idx[from_found], measure, **kwargs))
+
+    # a little slack so that rounding, in the cartesian coordinates or of the
+    # separations to dtype, does not lose pairs at max_distance
+    slack = 4 * np.finfo(dtype).eps * max_distance + 1e-6
+    if upper:
+        pairs = from_tree.query_pairs(max_distance + slack, output_type="ndarray")
+        pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        i, j = from_found[pairs[:, 0]], from_found[pairs[:, 1]]
+    else:
+        to_tree = cKDTree(_cartesian(pos, to_idx[to_found], measure, **kwargs))
+        cand = from_tree.sparse_distance_matrix(
+            to_tree, max_distance + slack, output_type="ndarray"
+        )
+        cand.sort(order=["i", "j"])
+        i, j = from_found[cand["i"]], to_found[cand["j"]]
+
+    kernel, fields, _ = _DISPATCH[measure]
+    if kernel is _euclidean_outer:
+        # the pairwise form of the same ECEF distance
+        kernel = _euclidean_rad
+    dist = _pair_distances(pos, fields, from_idx[i], to_idx[j], kernel, **kwargs)
+
+    # threshold the rounded separations, as for the separation matrix
+    dist = dist.astype(dtype, copy=False)
+    near = dist <= max_distance
+    return i[near], j[near], dist[near]
+
+
+def _get_separation(from_aircraft_id, to_aircraft_id, measure, **kwargs):
     """
     Get separation (geodesic, great circle, vertical or euclidean) between all pairs of "from" and "to" aircraft.
 
@@ -272,8 +706,8 @@ def _get_separation(from_aircraft_id, to_aircraft_id, distance_f, **kwargs):
         A string or list of strings of aircraft IDs.
     to_aircraft_id : str, [str], optional
        An optional string or list of strings of aircraft IDs. If not provided, ``to_aircraft_id=from_aircraft_id``
-    distance_f : function
-        One of ``[geodesic_distance, great_circle_distance, vertical_distance, euclidean_distance]``.
+    measure : str
+        One of ``["geodesic", "great_circle", "vertical", "euclidean"]``.
     **kwargs:
         major_semiaxis : double, optional
             The major (equatorial) radius of the ellipsoid. The default value is for WGS84.
@@ -281,16 +715,31 @@ def _get_separation(from_aircraft_id, to_aircraft_id, distance_f, **kwargs):
             Earth radius/major_semiaxis in metres. The default valus is for WGS84.
         flattening : double, optional
             Ellipsoid flattening. The default value is for WGS84.
+        dtype : numpy.dtype, optional
+            The floating point type of the separations. The default is ``numpy.float64``.
+        max_distance : double, optional
+            Only return the pairs of aircraft at most this far apart, in metres.
 
     Returns
     -------
     sep_df : pandas.DataFrame
        A dataframe with separation between all from_aircraft_id and to_aircraft_id pairs of aircraft.
+       If max_distance is given, a dataframe with a row for each pair of aircraft
+       at most max_distance apart, with columns
+       ``["from_aircraft_id", "to_aircraft_id", "separation"]``. If to_aircraft_id
+       is not given or is the same as from_aircraft_id, each pair is listed once and
+       aircraft are not paired with themselves.
 
     Notes
     -----
+    The separation between all pairs is computed at once on arrays of aircraft
+    positions, rather than one pair of aircraft at a time. Each thread makes
+    its BlueBird requests with its own session, so separations can safely be
+    computed from several threads.
+
     If any of the given aircraft IDs does not exist in the simulation, the
     returned dataframe contains a row or column of missing values for that ID.
+    If max_distance is given, that ID is left out of the returned pairs instead.
 
     Examples
     --------
@@ -302,6 +751,15 @@ def _get_separation(from_aircraft_id, to_aircraft_id, distance_f, **kwargs):
     )
     radius = _EARTH_RADIUS if "radius" not in kwargs else kwargs["radius"]
     flattening = _FLATTENING if "flattening" not in kwargs else kwargs["flattening"]
+    dtype = np.float64 if "dtype" not in kwargs else kwargs["dtype"]
+    max_distance = None if "max_distance" not in kwargs else kwargs["max_distance"]
+
+    utils._validate_is_positive(major_semiaxis, "major_semiaxis")
+    utils._validate_is_positive(radius, "radius")
+    utils._validate_is_positive(flattening, "flattening")
+    utils._validate_float_dtype(dtype)
+    if max_distance is not None:
+        utils._validate_is_positive(max_distance, "max_distance")
 
     if not isinstance(from_aircraft_id, list):
         from_aircraft_id = [from_aircraft_id]
@@ -310,31 +768,75 @@ def _get_separation(from_aircraft_id, to_aircraft_id, distance_f, **kwargs):
     if not isinstance(to_aircraft_id, list):
         to_aircraft_id = [to_aircraft_id]
 
-    pos_df = _get_pos_df(from_aircraft_id, to_aircraft_id)
-    all_distances = []
-    for from_id in from_aircraft_id:
-        if pos_df.loc[from_id][["current_flight_level", "longitude", "latitude"]].isnull().any():
-            distances = [np.nan] * len(to_aircraft_id)
-        else:
-            distances = [
-                distance_f(
-                    from_lat=pos_df.loc[from_id]["latitude"],
-                    from_lon=pos_df.loc[from_id]["longitude"],
-                    from_alt=pos_df.loc[from_id]["current_flight_level"],
-                    to_lat=pos_df.loc[to_id]["latitude"],
-                    to_lon=pos_df.loc[to_id]["longitude"],
-                    to_alt=pos_df.loc[to_id]["current_flight_level"],
-                    major_semiaxis=major_semiaxis,
-                    radius=radius,
-                    flattening=flattening,
-                )
-                if not pos_df.loc[to_id][["current_flight_level", "longitude", "latitude"]].isnull().any()
-                else np.nan
-                for to_id in to_aircraft_id
-            ]
-        all_distances.append(distances)
-
-    return pd.DataFrame(all_distances, columns=to_aircraft_id, index=from_aircraft_id)
+    pos = _get_pos_arrays(from_aircraft_id, to_aircraft_id)
+    idx = pos["idx"]
+    kernel, fields, triangle = _DISPATCH[measure]
+
+    # validate the positions the measure uses all at once, so the distances
+    # can be computed unchecked
+    found = ~pos["missing"]
+    if "lat_r" in fields:
+        utils._validate_latitude(pos["lat"][found])
+    if "lon_r" in fields:
+        utils._validate_longitude(pos["lon"][found])
+    if "alt" in fields:
+        utils._validate_is_positive(pos["alt"][found], "altitude")
+
+    fi = np.fromiter(
+        (idx[aircraft] for aircraft in from_aircraft_id),
+        dtype=np.intp,
+        count=len(from_aircraft_id),
+    )
+    ti = np.fromiter(
+        (idx[aircraft] for aircraft in to_aircraft_id),
+        dtype=np.intp,
+        count=len(to_aircraft_id),
+    )
+
+    params = dict(major_semiaxis=major_semiaxis, radius=radius, flattening=flattening)
+
+    if max_distance is not None:
+        # a self-separation lists each pair of aircraft once, and does not
+        # pair aircraft with themselves
+        i, j, dist = _near_separation(
+            pos,
+            fi,
+            ti,
+            measure,
+            max_distance,
+            dtype,
+            upper=from_aircraft_id == to_aircraft_id,
+            **params
+        )
+        return pd.DataFrame(
+            {
+                "from_aircraft_id": np.asarray(from_aircraft_id, dtype=object)[i],
+                "to_aircraft_id": np.asarray(to_aircraft_id, dtype=object)[j],
+                "separation": dist,
+            }
+        )
+
+    if from_aircraft_id == to_aircraft_id and triangle:
+        # separation is symmetric with a zero diagonal, so only compute the
+        # n(n-1)/2 pairs above the diagonal and mirror them
+        n = len(fi)
+        i, j = np.triu_indices(n, k=1)
+        dist = np.zeros((n, n), dtype=dtype)
+        dist[i, j] = dist[j, i] = _pair_distances(
+            pos, fields, fi[i], fi[j], kernel, **params
+        )
+    else:
+        dist = _pair_distances(pos, fields, fi[:, None], ti[None, :], kernel, **params)
+
+    # any pair involving an aircraft with a missing position is NaN. The
+    # kernels compute in double precision, as the haversine and euclidean
+    # formulas are ill-conditioned in single precision, and only the result
+    # is rounded to dtype.
+    nan_mask = pos["missing"][fi][:, None] | pos["missing"][ti][None, :]
+    dist = dist.astype(dtype, copy=False)
+    dist[nan_mask] = np.nan
+
+    return pd.DataFrame(dist, index=from_aircraft_id, columns=to_aircraft_id)
 
 
 def geodesic_separation(
@@ -342,6 +844,8 @@ def geodesic_separation(
     to_aircraft_id=None,
     major_semiaxis=_EARTH_RADIUS,
     flattening=_FLATTENING,
+    dtype=np.float64,
+    max_distance=None,
 ):
     """
     Get geodesic separation in metres between the positions of all from_aircraft_id and to_aircraft_id pairs of aircraft.
@@ -356,6 +860,17 @@ def geodesic_separation(
         The major (equatorial) radius of the ellipsoid. The default value is for WGS84.
     flattening : double, optional
         Ellipsoid flattening. The default value is for WGS84.
+    dtype : numpy.dtype, optional
+        The floating point type of the separations. The default is
+        ``numpy.float64``. ``numpy.float32`` halves the memory and bandwidth
+        used by large separation matrices, at the cost of precision: the
+        separations are computed in double precision and rounded to within a
+        metre.
+    max_distance : double, optional
+        Only return the pairs of aircraft at most this distance apart, in
+        metres. The pairs are found with a spatial index, so the separation of
+        all pairs of aircraft is not computed or stored. A pair exactly
+        max_distance apart may be rounded either side of it.
 
     Returns
     -------
@@ -364,28 +879,42 @@ def geodesic_separation(
         to_aircraft_id as column names. The values are the geodesic distance in
         metres between the positions of the aircraft pair at each
         ``[from_aircraft_id, to_aircraft_id]`` index.
+        If max_distance is given, a dataframe with a row for each pair of
+        aircraft at most max_distance apart instead, with columns
+        ``["from_aircraft_id", "to_aircraft_id", "separation"]``. If
+        to_aircraft_id is not given or is the same as from_aircraft_id, each
+        pair of aircraft is listed once and aircraft are not paired with
+        themselves.
 
     Notes
     -----
     If any of the given aircraft IDs does not exist in the simulation, the
     returned dataframe contains a row or column of missing values for that ID.
+    If max_distance is given, that ID is left out of the returned pairs instead.
 
     Examples
     --------
     >>> pydodo.geodesic_separation(from_aircraft_id = "BAW123", to_aircraft_id = "KLM456")
     >>> pydodo.geodesic_separation(from_aircraft_id = ["BAW123", "KLM456"])
+    >>> pydodo.geodesic_separation(from_aircraft_id = ["BAW123", "KLM456"], max_distance = 10000)
     """
     return _get_separation(
         from_aircraft_id,
         to_aircraft_id,
-        distance_f=geodesic_distance,
+        measure="geodesic",
         major_semiaxis=major_semiaxis,
         flattening=flattening,
+        dtype=dtype,
+        max_distance=max_distance,
     )
 
 
 def great_circle_separation(
-    from_aircraft_id, to_aircraft_id=None, radius=_EARTH_RADIUS
+    from_aircraft_id,
+    to_aircraft_id=None,
+    radius=_EARTH_RADIUS,
+    dtype=np.float64,
+    max_distance=None,
 ):
     """
     Get great circle separation in metres between the positions of all from_aircraft_id and to_aircraft_id pairs of aircraft.
@@ -398,6 +927,17 @@ def great_circle_separation(
        An optional string or list of strings of aircraft IDs. If not provided, ``to_aircraft_id=from_aircraft_id``
     radius : doubl, optional
         The radius of the earth in metres. The default value for WGS84.
+    dtype : numpy.dtype, optional
+        The floating point type of the separations. The default is
+        ``numpy.float64``. ``numpy.float32`` halves the memory and bandwidth
+        used by large separation matrices, at the cost of precision: the
+        separations are computed in double precision and rounded to within a
+        metre.
+    max_distance : double, optional
+        Only return the pairs of aircraft at most this distance apart, in
+        metres. The pairs are found with a spatial index, so the separation of
+        all pairs of aircraft is not computed or stored. A pair exactly
+        max_distance apart may be rounded either side of it.
 
     Returns
     -------
@@ -406,26 +946,38 @@ def great_circle_separation(
         `to_aircraft_id` as column names. The values are the great circle distance in
         metres between the positions of the aircraft pair at each
         ``[from_aircraft_id, to_aircraft_id]`` index.
+        If max_distance is given, a dataframe with a row for each pair of
+        aircraft at most max_distance apart instead, with columns
+        ``["from_aircraft_id", "to_aircraft_id", "separation"]``. If
+        to_aircraft_id is not given or is the same as from_aircraft_id, each
+        pair of aircraft is listed once and aircraft are not paired with
+        themselves.
 
     Notes
     -----
     If any of the given aircraft IDs does not exist in the simulation, the
     returned dataframe contains a row or column of missing values for that ID.
+    If max_distance is given, that ID is left out of the returned pairs instead.
 
     Examples
     --------
     >>> pydodo.great_circle_separation(from_aircraft_id = "BAW123", to_aircraft_id = "KLM456")
     >>> pydodo.great_circle_separation(from_aircraft_id = ["BAW123", "KLM456"])
+    >>> pydodo.great_circle_separation(from_aircraft_id = ["BAW123", "KLM456"], max_distance = 10000)
     """
     return _get_separation(
         from_aircraft_id,
         to_aircraft_id,
-        distance_f=great_circle_distance,
+        measure="great_circle",
         radius=radius,
+        dtype=dtype,
+        max_distance=max_distance,
     )
 
 
-def vertical_separation(from_aircraft_id, to_aircraft_id=None):
+def vertical_separation(
+    from_aircraft_id, to_aircraft_id=None, dtype=np.float64, max_distance=None
+):
     """
     Get vertical separation in metres between the positions of all from_aircraft_id and to_aircraft_id pairs of aircraft.
 
@@ -435,6 +987,17 @@ def vertical_separation(from_aircraft_id, to_aircraft_id=None):
         A string or list of strings of aircraft IDs.
     to_aircraft_id : str, [str], optional
        An optional string or list of strings of aircraft IDs. If not provided, ``to_aircraft_id=from_aircraft_id``
+    dtype : numpy.dtype, optional
+        The floating point type of the separations. The default is
+        ``numpy.float64``. ``numpy.float32`` halves the memory and bandwidth
+        used by large separation matrices, at the cost of precision: the
+        separations are computed in double precision and rounded to within a
+        metre.
+    max_distance : double, optional
+        Only return the pairs of aircraft at most this distance apart, in
+        metres. The pairs are found with a spatial index, so the separation of
+        all pairs of aircraft is not computed or stored. A pair exactly
+        max_distance apart may be rounded either side of it.
 
     Returns
     -------
@@ -443,19 +1006,31 @@ def vertical_separation(from_aircraft_id, to_aircraft_id=None):
         to_aircraft_id as column names. The values are the vertical distance in
         metres between the positions of the aircraft pair at each
         ``[from_aircraft_id, to_aircraft_id]`` index.
+        If max_distance is given, a dataframe with a row for each pair of
+        aircraft at most max_distance apart instead, with columns
+        ``["from_aircraft_id", "to_aircraft_id", "separation"]``. If
+        to_aircraft_id is not given or is the same as from_aircraft_id, each
+        pair of aircraft is listed once and aircraft are not paired with
+        themselves.
 
     Notes
     -----
     If any of the given aircraft IDs does not exist in the simulation, the
     returned dataframe contains a row or column of missing values for that ID.
+    If max_distance is given, that ID is left out of the returned pairs instead.
 
     Examples
     --------
     >>> pydodo.vertical_separation(from_aircraft_id = "BAW123", to_aircraft_id = "KLM456")
     >>> pydodo.vertical_separation(from_aircraft_id = ["BAW123", "KLM456"])
+    >>> pydodo.vertical_separation(from_aircraft_id = ["BAW123", "KLM456"], max_distance = 300)
     """
     return _get_separation(
-        from_aircraft_id, to_aircraft_id, distance_f=vertical_distance
+        from_aircraft_id,
+        to_aircraft_id,
+        measure="vertical",
+        dtype=dtype,
+        max_distance=max_distance,
     )
 
 
@@ -464,6 +1039,8 @@ def euclidean_separation(
     to_aircraft_id=None,
     major_semiaxis=_EARTH_RADIUS,
     flattening=_FLATTENING,
+    dtype=np.float64,
+    max_distance=None,
 ):
     """
     Get euclidean separation in metres between the positions of all
@@ -480,6 +1057,17 @@ def euclidean_separation(
         The major (equatorial) radius of the ellipsoid. The default value is for WGS84.
     flattening : double, optional
         Ellipsoid flattening. The default value is for WGS84.
+    dtype : numpy.dtype, optional
+        The floating point type of the separations. The default is
+        ``numpy.float64``. ``numpy.float32`` halves the memory and bandwidth
+        used by large separation matrices, at the cost of precision: the
+        separations are computed in double precision and rounded to within a
+        metre.
+    max_distance : double, optional
+        Only return the pairs of aircraft at most this distance apart, in
+        metres. The pairs are found with a spatial index, so the separation of
+        all pairs of aircraft is not computed or stored. A pair exactly
+        max_distance apart may be rounded either side of it.
 
     Returns
     -------
@@ -488,6 +1076,12 @@ def euclidean_separation(
         `to_aircraft_id` as column names. The values are the euclidean distance in
         metres between the positions of the aircraft pair at each
         ``[from_aircraft_id, to_aircraft_id]`` index.
+        If max_distance is given, a dataframe with a row for each pair of
+        aircraft at most max_distance apart instead, with columns
+        ``["from_aircraft_id", "to_aircraft_id", "separation"]``. If
+        to_aircraft_id is not given or is the same as from_aircraft_id, each
+        pair of aircraft is listed once and aircraft are not paired with
+        themselves.
 
     Notes
     -----
@@ -495,16 +1089,20 @@ def euclidean_separation(
 
     If any of the given aircraft IDs does not exist in the simulation, the
     returned dataframe contains a row or column of missing values for that ID.
+    If max_distance is given, that ID is left out of the returned pairs instead.
 
     Examples
     --------
     >>> pydodo.euclidean_separation(from_aircraft_id = "BAW123", to_aircraft_id = "KLM456")
     >>> pydodo.euclidean_separation(from_aircraft_id = ["BAW123", "KLM456"])
+    >>> pydodo.euclidean_separation(from_aircraft_id = ["BAW123", "KLM456"], max_distance = 10000)
     """
     return _get_separation(
         from_aircraft_id,
         to_aircraft_id,
-        distance_f=euclidean_distance,
+        measure="euclidean",
         major_semiaxis=major_semiaxis,
         flattening=flattening,
+        dtype=dtype,
+        max_distance=max_distance,
     )
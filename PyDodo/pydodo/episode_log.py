@@ -1,9 +1,8 @@
-import requests
 import json
 import os
 
 from . import utils
-from .bluebird_connect import construct_endpoint_url
+from .bluebird_connect import _session, construct_endpoint_url
 from .post_request import post_request
 from .config_param import config_param
 
@@ -29,7 +28,7 @@ def episode_log():
     endpoint = config_param("endpoint_episode_log")
     url = construct_endpoint_url(endpoint)
 
-    resp = requests.get(url)
+    resp = _session().get(url)
     resp.raise_for_status()
 
     content = json.loads(resp.text)
@@ -5,7 +5,7 @@ import pandas as pd
 from . import utils
 from .post_request import post_request
 from .config_param import config_param
-from .bluebird_connect import construct_endpoint_url
+from .bluebird_connect import _session, construct_endpoint_url
 
 endpoint = config_param("endpoint_list_route")
 
@@ -43,7 +43,7 @@ def _route_call(aircraft_id):
     the callsign is returned.
     """
     url = construct_endpoint_url(endpoint)
-    resp = requests.get(url, params={config_param("query_aircraft_id"): aircraft_id})
+    resp = _session().get(url, params={config_param("query_aircraft_id"): aircraft_id})
     if resp.status_code == 200:
         return json.loads(resp.text)
     elif response.status == config_param("status_code_aircraft_has_no_route"):
@@ -4,7 +4,7 @@ import requests
 import numpy as np
 
 from . import utils
-from .bluebird_connect import construct_endpoint_url
+from .bluebird_connect import _session, construct_endpoint_url
 from .config_param import config_param
 
 endpoint = config_param("endpoint_metrics")
@@ -28,7 +28,7 @@ def _metrics_call(metric, args):
         args does not exist in the simulation)
     """
     url = construct_endpoint_url(endpoint)
-    resp = requests.get(url, params={"name": metric, "args": args})
+    resp = _session().get(url, params={"name": metric, "args": args})
     if resp.status_code == 200:
         json_data = json.loads(resp.text)
         score = json_data[metric]
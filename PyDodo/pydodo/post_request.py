@@ -1,6 +1,4 @@
-import requests
-
-from .bluebird_connect import construct_endpoint_url
+from .bluebird_connect import _session, construct_endpoint_url
 
 
 def post_request(endpoint, body=None):
@@ -25,7 +23,7 @@ def post_request(endpoint, body=None):
     >>> pydodo.utils.post_request(endpoint = endpoint, body = body)
     """
     url = construct_endpoint_url(endpoint)
-    resp = requests.post(url, json=body)
+    resp = _session().post(url, json=body)
     # if response is 4XX or 5XX, raise exception
     resp.raise_for_status()
     return True
@@ -6,7 +6,7 @@ import pandas as pd
 
 from . import utils
 from .config_param import config_param
-from .bluebird_connect import construct_endpoint_url
+from .bluebird_connect import _session, construct_endpoint_url
 
 endpoint = config_param("endpoint_aircraft_position")
 
@@ -44,9 +44,9 @@ def _position_call(aircraft_id=None):
     url = construct_endpoint_url(endpoint)
 
     if aircraft_id == None:
-        resp = requests.get(url)
+        resp = _session().get(url)
     else:
-        resp = requests.get(
+        resp = _session().get(
             url, params={config_param("query_aircraft_id"): aircraft_id}
         )
     if resp.status_code == 200:
@@ -1,7 +1,6 @@
-import requests
 import json
 
-from .bluebird_connect import construct_endpoint_url
+from .bluebird_connect import _session, construct_endpoint_url
 from .config_param import config_param
 
 
@@ -62,7 +61,7 @@ def simulation_info():
     endpoint = config_param("endpoint_simulation_info")
     url = construct_endpoint_url(endpoint)
 
-    resp = requests.get(url)
+    resp = _session().get(url)
     resp.raise_for_status()
 
     info = json.loads(resp.text)
@@ -1,14 +1,27 @@
+import numpy as np
+
 from .config_param import config_param
 
 
 def _validate_latitude(lat):
-    """Assert latitude is in the range ``[-90, 90]``."""
-    assert abs(lat) <= 90, "Invalid value {} for latitude".format(lat)
+    """Assert latitude (a scalar or an array) is in the range ``[-90, 90]``."""
+    assert np.all(np.abs(lat) <= 90), "Invalid value {} for latitude".format(lat)
 
 
 def _validate_longitude(lon):
-    """Assert longitude is in the range ``[-180, 180)``."""
-    assert -180 <= lon < 180, "Invalid value {} for longitude".format(lon)
+    """Assert longitude (a scalar or an array) is in the range ``[-180, 180)``."""
+    lon = np.asarray(lon)
+    assert np.all((-180 <= lon) & (lon < 180)), "Invalid value {} for longitude".format(
+        lon
+    )
+
+
+def _validate_float_dtype(dtype):
+    """Assert dtype is ``numpy.float32`` or ``numpy.float64``."""
+    assert dtype is not None and np.dtype(dtype) in [
+        np.float32,
+        np.float64,
+    ], "Invalid value {} for dtype".format(dtype)
 
 
 def _validate_heading(hdg):
@@ -96,5 +109,7 @@ def _validate_multiplier(dtmult):
 
 
 def _validate_is_positive(val, param_name):
-    """Assert val is non-negative."""
-    assert val >= 0, "Invalid value {} for {}".format(val, param_name)
+    """Assert val (a scalar or an array) is non-negative."""
+    assert np.all(np.asarray(val) >= 0), "Invalid value {} for {}".format(
+        val, param_name
+    )
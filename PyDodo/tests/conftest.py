@@ -7,12 +7,19 @@ import numpy as np
 from geopy import distance
 from pydodo.config_param import config_param
 from pydodo import upload_sector, upload_scenario
+from pydodo.bluebird_connect import ping_bluebird
 
 major_semiaxis, _, _ = distance.ELLIPSOIDS["WGS-84"]
 _EARTH_RADIUS = major_semiaxis * 1000
 
 _ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 
+@pytest.fixture(scope="session")
+def bb_resp():
+    """Check once per test session whether BlueBird is running."""
+    return ping_bluebird()
+
+
 @pytest.fixture
 def rootdir():
     return _ROOT_DIR
@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def skip_without_bluebird(bb_resp):
+    """Skip integration tests if BlueBird is not running."""
+    if not bb_resp:
+        pytest.skip("Can't connect to bluebird")
@@ -15,13 +15,9 @@ from pydodo import (
     simulation_info,
     set_simulation_rate_multiplier,
 )
-from pydodo.bluebird_connect import ping_bluebird
 from pydodo.config_param import config_param
 
-bb_resp = ping_bluebird()
 
-
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_upload_scenario(rootdir):
     """
     Runs through a basic scenario covering all the main functionality
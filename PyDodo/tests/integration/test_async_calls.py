@@ -11,13 +11,8 @@ from pydodo import (
     all_positions,
     simulation_step
 )
-from pydodo.bluebird_connect import ping_bluebird
 
-# test if can connect to BlueBird
-bb_resp = ping_bluebird()
 
-
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_bluesky_response():
     """Test that bluesky is running and responding before any other tests are run"""
     resp = reset_simulation()
@@ -27,7 +22,6 @@ def test_bluesky_response():
 @pytest.mark.skipif(
     os.environ.get("TRAVIS") == "true", reason="Skipping this test on Travis CI"
 )
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_async_request(upload_test_sector_scenario):
     """
     Tests async_request() function
@@ -7,13 +7,8 @@ from pydodo import (
     all_positions,
     simulation_step,
 )
-from pydodo.bluebird_connect import ping_bluebird
 
-# test if can connect to BlueBird
-bb_resp = ping_bluebird()
 
-
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_change_altitude(upload_test_sector_scenario):
 
     cmd = reset_simulation()
@@ -2,13 +2,8 @@ import pytest
 import time
 
 from pydodo import change_speed, reset_simulation, create_aircraft, aircraft_position, simulation_step
-from pydodo.bluebird_connect import ping_bluebird
 
-# test if can connect to BlueBird
-bb_resp = ping_bluebird()
 
-
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_change_speed():
     cmd = reset_simulation()
     assert cmd == True
@@ -2,7 +2,6 @@ import pytest
 from requests.exceptions import HTTPError
 
 from pydodo import create_aircraft, reset_simulation
-from pydodo.bluebird_connect import ping_bluebird
 
 # Valid input parameter values
 aircraft_id = "TST1001"
@@ -14,11 +13,7 @@ altitude = None
 flight_level = 250
 speed = 200
 
-# test if can connect to BlueBird
-bb_resp = ping_bluebird()
 
-
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_output_create_aircraft():
 
     # reset so that no aircraft exist
@@ -2,12 +2,8 @@ import pytest
 
 from pydodo import reset_simulation, all_positions
 from pydodo import current_flight_level, cleared_flight_level, requested_flight_level
-from pydodo.bluebird_connect import ping_bluebird
 
-bb_resp = ping_bluebird()
 
-
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_flight_level(upload_test_sector_scenario):
 
     cmd = reset_simulation()
@@ -9,9 +9,7 @@ from pydodo import (
     create_aircraft,
     loss_of_separation,
 )
-from pydodo.bluebird_connect import ping_bluebird
 
-bb_resp = ping_bluebird()
 
 aircraft_id = "TST1001"
 type = "B744"
@@ -30,7 +28,6 @@ flight_level_2 = 200
 speed_2 = 0
 
 
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_loss_of_separation():
     """
     Tests loss_of_separation returns correct separation score.
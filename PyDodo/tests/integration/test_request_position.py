@@ -3,9 +3,7 @@ import pandas as pd
 import numpy as np
 
 from pydodo import aircraft_position, all_positions, reset_simulation, create_aircraft
-from pydodo.bluebird_connect import ping_bluebird
 
-bb_resp = ping_bluebird()
 
 # TWO EXAMPLE AIRCRAFT
 aircraft_id = "TST1001"
@@ -25,7 +23,6 @@ flight_level_2 = 200
 speed_2 = 0
 
 
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_no_positions():
     """
     Expect empty dataframe when no aircraft exist.
@@ -37,7 +34,6 @@ def test_no_positions():
     assert pos_df.empty
 
 
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_wrong_id():
     """
     Expect a row in a dataframe with NAN if requested aircraft not in simulation.
@@ -65,7 +61,6 @@ def test_wrong_id():
     assert pos.loc[aircraft_id_2].isnull().all()
 
 
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_all_positions():
     cmd = reset_simulation()
     assert cmd == True
@@ -129,7 +124,6 @@ def test_all_positions():
     assert isinstance(pos.sim_t, float)
 
 
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_aircraft_position():
     cmd = reset_simulation()
     assert cmd == True
@@ -8,13 +8,8 @@ from pydodo import (
     all_positions,
     list_route,
 )
-from pydodo.bluebird_connect import ping_bluebird
 
-# test if can connect to BlueBird
-bb_resp = ping_bluebird()
 
-
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_route_waypoints(upload_test_sector_scenario):
     """
     Test list_route(), direct_to_waypoint()
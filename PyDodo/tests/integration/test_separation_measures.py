@@ -15,9 +15,7 @@ from pydodo import (
     vertical_separation,
     euclidean_separation,
 )
-from pydodo.bluebird_connect import ping_bluebird
 
-bb_resp = ping_bluebird()
 
 # TWO EXAMPLE AIRCRAFT
 aircraft_id = "TST1001"
@@ -39,7 +37,6 @@ speed_2 = 0
 SCALE_FEET_TO_METRES = 0.3048
 
 
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_separation(expected_great_circle):
     """
     Tests that all separation functions return a dataframe using a variety of inputs.
@@ -118,7 +115,6 @@ def test_separation(expected_great_circle):
     assert separation5.loc[aircraft_id_2, aircraft_id_2] == 0
 
 
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 def test_wrong_id():
     """
     Test separation functions when one of provided IDs does not exist in simulation.
@@ -165,3 +161,80 @@ def test_wrong_id():
     )
     assert isinstance(separation4, pd.DataFrame)
     assert np.isnan(separation4.loc[aircraft_id, aircraft_id_2])
+
+
+def test_max_distance():
+    """
+    Test that separation functions only return the pairs of aircraft within
+    max_distance of each other when it is given.
+    """
+    cmd = reset_simulation()
+    assert cmd == True
+
+    cmd = create_aircraft(
+        aircraft_id=aircraft_id,
+        type=type,
+        latitude=latitude,
+        longitude=longitude,
+        heading=heading,
+        flight_level=flight_level,
+        speed=speed,
+    )
+    assert cmd == True
+
+    cmd = create_aircraft(
+        aircraft_id=aircraft_id_2,
+        type=type_2,
+        latitude=latitude_2,
+        longitude=longitude_2,
+        heading=heading_2,
+        flight_level=flight_level_2,
+        speed=speed_2,
+    )
+    assert cmd == True
+
+    from_ids = [aircraft_id, aircraft_id_2]
+    for separation_fn in [
+        geodesic_separation,
+        great_circle_separation,
+        vertical_separation,
+        euclidean_separation,
+    ]:
+        dense = separation_fn(from_aircraft_id=from_ids, to_aircraft_id=aircraft_id_2)
+        dist = dense.loc[aircraft_id, aircraft_id_2]
+
+        # allow for the near separations being rounded differently
+        near = separation_fn(
+            from_aircraft_id=from_ids,
+            to_aircraft_id=aircraft_id_2,
+            max_distance=dist * (1 + 1e-9),
+        )
+        assert isinstance(near, pd.DataFrame)
+        assert list(near.columns) == [
+            "from_aircraft_id",
+            "to_aircraft_id",
+            "separation",
+        ]
+        assert list(near["from_aircraft_id"]) == from_ids
+        assert near["separation"].to_numpy() == pytest.approx([dist, 0])
+
+        near = separation_fn(
+            from_aircraft_id=from_ids,
+            to_aircraft_id=aircraft_id_2,
+            max_distance=dist / 2,
+        )
+        assert list(near["from_aircraft_id"]) == [aircraft_id_2]
+
+    near = vertical_separation(
+        from_aircraft_id=[aircraft_id, "MISSING"],
+        to_aircraft_id=[aircraft_id_2, "MISSING"],
+        max_distance=2000,
+    )
+    assert list(near["from_aircraft_id"]) == [aircraft_id]
+    assert list(near["to_aircraft_id"]) == [aircraft_id_2]
+
+    near = euclidean_separation(
+        from_aircraft_id=[aircraft_id, aircraft_id_2], max_distance=1e6
+    )
+    assert list(near["from_aircraft_id"]) == [aircraft_id]
+    assert list(near["to_aircraft_id"]) == [aircraft_id_2]
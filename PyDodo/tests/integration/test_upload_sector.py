@@ -8,14 +8,11 @@ from pydodo import (
     reset_simulation,
     upload_sector
 )
-from pydodo.bluebird_connect import ping_bluebird
 from pydodo.config_param import config_param
 
-bb_resp = ping_bluebird()
 bluesky_sim = config_param("simulator") == config_param("bluesky_simulator")
 
 
-@pytest.mark.skipif(not bb_resp, reason="Can't connect to bluebird")
 # @pytest.mark.skipif(not bluesky_sim, reason="Not using BlueSky")
 def test_upload_sector(rootdir):
     """
@@ -1,7 +1,13 @@
 import pytest
+import threading
 
-from pydodo import bluebird_config
-from pydodo.bluebird_connect import get_bluebird_url, construct_endpoint_url
+from pydodo import bluebird_config, config_param
+from pydodo.bluebird_connect import (
+    _invalidate,
+    _session,
+    get_bluebird_url,
+    construct_endpoint_url,
+)
 
 def test_bluebird_config():
 
@@ -9,6 +15,9 @@ def test_bluebird_config():
     port = 2001
     version = 'v25'
 
+    # URLs are cached, so make sure a cached URL is updated by bluebird_config
+    get_bluebird_url()
+
     resp = bluebird_config(host=host, port=port, version=version)
     assert resp == True
 
@@ -18,3 +27,33 @@ def test_bluebird_config():
     endpoint="POS"
     endpoint_url = construct_endpoint_url(endpoint)
     assert endpoint_url == "{0}/{1}".format(url, endpoint)
+
+
+def test_session_per_thread():
+    """
+    Each thread reuses its own session for BlueBird requests.
+    """
+    assert _session() is _session()
+
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(_session()))
+    thread.start()
+    thread.join()
+    assert sessions[0] is not _session()
+
+
+def test_invalidate_config(tmp_path):
+    """
+    The config file is read once, and again after the caches are cleared.
+    """
+    cfg_file = str(tmp_path / "config.yml")
+    with open(cfg_file, "w") as f:
+        f.write("default:\n  host: first_host\n")
+    assert config_param("host", cfg_file=cfg_file) == "first_host"
+
+    with open(cfg_file, "w") as f:
+        f.write("default:\n  host: second_host\n")
+    assert config_param("host", cfg_file=cfg_file) == "first_host"
+
+    _invalidate()
+    assert config_param("host", cfg_file=cfg_file) == "second_host"
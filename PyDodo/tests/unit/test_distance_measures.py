@@ -1,5 +1,6 @@
 import pytest
 import math
+import numpy as np
 
 from pydodo import (
     geodesic_distance,
@@ -127,3 +128,35 @@ def test_optional_params(from_lat, from_lon, to_lat, to_lon):
     assert result2 == pytest.approx(
         great_circle_distance(from_lat, from_lon, to_lat, to_lon, radius=r), 0.01
     )
+
+
+def test_array_inputs():
+    """
+    Distance functions also accept arrays of points and return an array of
+    distances, equal to the distances between each pair of points.
+    """
+    from_lat = np.array([51.507389, 0, 89])
+    from_lon = np.array([0.127806, 0, 40])
+    to_lat = np.array([50.6083, 0, 89.1])
+    to_lon = np.array([-1.9608, 0, 40])
+    from_alt = np.array([50, 1, 0])
+    to_alt = np.array([50, 11, 100])
+
+    geodesic = geodesic_distance(from_lat, from_lon, to_lat, to_lon)
+    great_circle = great_circle_distance(from_lat, from_lon, to_lat, to_lon)
+    vertical = vertical_distance(from_alt, to_alt)
+    euclidean = euclidean_distance(from_lat, from_lon, from_alt, to_lat, to_lon, to_alt)
+
+    for i in range(len(from_lat)):
+        lat_lon = (from_lat[i], from_lon[i], to_lat[i], to_lon[i])
+        assert geodesic[i] == pytest.approx(geodesic_distance(*lat_lon))
+        assert great_circle[i] == pytest.approx(great_circle_distance(*lat_lon))
+        assert vertical[i] == vertical_distance(from_alt[i], to_alt[i])
+        assert euclidean[i] == pytest.approx(
+            euclidean_distance(
+                from_lat[i], from_lon[i], from_alt[i], to_lat[i], to_lon[i], to_alt[i]
+            )
+        )
+
+    with pytest.raises(AssertionError):
+        great_circle_distance(np.array([0, 91]), 0, 0, 0)
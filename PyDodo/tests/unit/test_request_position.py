@@ -56,7 +56,7 @@ def mocked_requests_get(*args, **kwargs):
     return MockResponse(None, 404)
 
 
-@patch("requests.get", side_effect=mocked_requests_get)
+@patch("requests.Session.get", side_effect=mocked_requests_get)
 def test_output_format(mock_get):
     """
     Check request output is formatted correctly.
@@ -0,0 +1,268 @@
+import pytest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+from pydodo import (
+    geodesic_distance,
+    great_circle_distance,
+    vertical_distance,
+    euclidean_distance,
+    geodesic_separation,
+    great_circle_separation,
+    vertical_separation,
+    euclidean_separation,
+)
+
+SCALE_FEET_TO_METRES = 0.3048
+
+positions = pd.DataFrame(
+    {
+        "aircraft_type": "B744",
+        "latitude": [51.507389, 50.6083, 31.5, 95.0, -51.5, -33.9],
+        "longitude": [0.127806, -1.9608, 35.5, 0.0, -179.8, 151.2],
+        "current_flight_level": [25000, 20000, -11, 1000, 35000, 30000],
+    },
+    index=["TST1001", "TST2002", "LOW", "BADLAT", "ANTIPODE", "FAR"],
+)
+
+
+def mocked_aircraft_position(aircraft_id):
+    """
+    Positions of the given aircraft, with missing values for unknown aircraft.
+    """
+    return positions.reindex(aircraft_id)
+
+
+@pytest.fixture(autouse=True)
+def mock_positions():
+    with patch(
+        "pydodo.distance_measures.aircraft_position",
+        side_effect=mocked_aircraft_position,
+    ):
+        yield
+
+
+def pair_distance(distance_fn, from_id, to_id):
+    """
+    Distance between two aircraft using a scalar distance function.
+    """
+    from_pos, to_pos = positions.loc[from_id], positions.loc[to_id]
+    from_alt = from_pos["current_flight_level"] * SCALE_FEET_TO_METRES
+    to_alt = to_pos["current_flight_level"] * SCALE_FEET_TO_METRES
+    if distance_fn is vertical_distance:
+        return distance_fn(from_alt, to_alt)
+    if distance_fn is euclidean_distance:
+        return distance_fn(
+            from_pos["latitude"],
+            from_pos["longitude"],
+            from_alt,
+            to_pos["latitude"],
+            to_pos["longitude"],
+            to_alt,
+        )
+    return distance_fn(
+        from_pos["latitude"],
+        from_pos["longitude"],
+        to_pos["latitude"],
+        to_pos["longitude"],
+    )
+
+
+@pytest.mark.parametrize(
+    "separation_fn,distance_fn",
+    [
+        (geodesic_separation, geodesic_distance),
+        (great_circle_separation, great_circle_distance),
+        (vertical_separation, vertical_distance),
+        (euclidean_separation, euclidean_distance),
+    ],
+)
+@pytest.mark.parametrize(
+    "from_ids,to_ids",
+    [
+        (["TST1001", "TST2002", "FAR", "ANTIPODE"], None),
+        (["TST1001", "FAR", "TST1001", "MISSING"], None),
+        (["TST1001", "TST2002", "MISSING"], ["FAR", "TST2002", "ANTIPODE"]),
+        ("FAR", "TST2002"),
+    ],
+)
+def test_separation_values(separation_fn, distance_fn, from_ids, to_ids):
+    """
+    Check each separation against the distance between the pair of aircraft,
+    for self-separations, duplicate and missing IDs and distinct from and to
+    aircraft.
+    """
+    separation = separation_fn(from_aircraft_id=from_ids, to_aircraft_id=to_ids)
+
+    from_ids = from_ids if isinstance(from_ids, list) else [from_ids]
+    if to_ids is None:
+        to_ids = from_ids
+    to_ids = to_ids if isinstance(to_ids, list) else [to_ids]
+    assert separation.shape == (len(from_ids), len(to_ids))
+    assert list(separation.index) == from_ids
+    assert list(separation.columns) == to_ids
+
+    for i, from_id in enumerate(from_ids):
+        for j, to_id in enumerate(to_ids):
+            result = separation.iloc[i, j]
+            if "MISSING" in [from_id, to_id]:
+                assert np.isnan(result)
+            else:
+                assert result == pytest.approx(
+                    pair_distance(distance_fn, from_id, to_id), rel=1e-9, abs=1e-6
+                )
+
+
+@pytest.mark.parametrize(
+    "separation_fn", [geodesic_separation, great_circle_separation]
+)
+def test_negative_altitude(separation_fn):
+    """
+    Check that horizontal separations do not validate altitudes.
+    """
+    separation = separation_fn(from_aircraft_id="LOW", to_aircraft_id="TST1001")
+    assert separation.loc["LOW", "TST1001"] > 0
+
+    with pytest.raises(AssertionError):
+        euclidean_separation(from_aircraft_id="LOW", to_aircraft_id="TST1001")
+
+
+def test_invalid_latitude():
+    """
+    Check that only the separations using latitude validate it.
+    """
+    separation = vertical_separation(
+        from_aircraft_id="BADLAT", to_aircraft_id="TST2002"
+    )
+    assert separation.loc["BADLAT", "TST2002"] == pytest.approx(
+        19000 * SCALE_FEET_TO_METRES
+    )
+
+    for separation_fn in [
+        geodesic_separation,
+        great_circle_separation,
+        euclidean_separation,
+    ]:
+        with pytest.raises(AssertionError):
+            separation_fn(from_aircraft_id="BADLAT", to_aircraft_id="TST2002")
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize(
+    "separation_fn,max_distance",
+    [
+        (geodesic_separation, 300000),
+        (great_circle_separation, 300000),
+        (vertical_separation, 1000),
+        (euclidean_separation, 300000),
+    ],
+)
+def test_max_distance(separation_fn, max_distance, dtype):
+    """
+    Check that the near pairs of aircraft match the separation matrix
+    thresholded at max_distance.
+    """
+    rel = 1e-9 if dtype == np.float64 else 1e-6
+    rng = np.random.default_rng(0)
+    n = 100
+    many = pd.DataFrame(
+        {
+            "aircraft_type": "B744",
+            "latitude": rng.uniform(45, 60, n),
+            "longitude": rng.uniform(-10, 5, n),
+            "current_flight_level": rng.uniform(0, 40000, n),
+        },
+        index=["TST{:04d}".format(i) for i in range(n)],
+    )
+    from_ids = list(many.index[:60]) + ["MISSING"]
+    to_ids = list(many.index[40:])
+
+    with patch(
+        "pydodo.distance_measures.aircraft_position",
+        side_effect=lambda aircraft_id: many.reindex(aircraft_id),
+    ):
+        dense = separation_fn(
+            from_aircraft_id=from_ids, to_aircraft_id=to_ids, dtype=dtype
+        )
+        near = separation_fn(
+            from_aircraft_id=from_ids,
+            to_aircraft_id=to_ids,
+            dtype=dtype,
+            max_distance=max_distance,
+        )
+
+        expected = dense.stack()
+        expected = expected[expected <= max_distance]
+        assert 0 < len(near) < dense.size
+        assert near["separation"].dtype == dtype
+        assert (near["separation"] <= max_distance).all()
+        assert list(zip(near["from_aircraft_id"], near["to_aircraft_id"])) == list(
+            expected.index
+        )
+        assert near["separation"].to_numpy() == pytest.approx(
+            expected.to_numpy(), rel=rel, abs=1e-6
+        )
+
+        # a self-separation lists each pair of distinct aircraft once
+        dense = separation_fn(from_aircraft_id=from_ids, dtype=dtype)
+        near = separation_fn(
+            from_aircraft_id=from_ids, dtype=dtype, max_distance=max_distance
+        )
+
+        upper = np.triu(np.ones(dense.shape, dtype=bool), k=1)
+        expected = dense.where(upper).stack()
+        expected = expected[expected <= max_distance]
+        assert list(zip(near["from_aircraft_id"], near["to_aircraft_id"])) == list(
+            expected.index
+        )
+        assert near["separation"].to_numpy() == pytest.approx(
+            expected.to_numpy(), rel=rel, abs=1e-6
+        )
+
+        # every pair is kept at a max_distance of its own separation, allowing
+        # for double precision separations being rounded differently
+        for from_id, to_id in [(from_ids[i], to_ids[i]) for i in range(20)]:
+            dist = float(dense.loc[from_id, to_id])
+            if dtype == np.float64:
+                dist *= 1 + 1e-9
+            near = separation_fn(
+                from_aircraft_id=from_id,
+                to_aircraft_id=to_id,
+                dtype=dtype,
+                max_distance=dist,
+            )
+            assert len(near) == 1
+
+
+@pytest.mark.parametrize(
+    "separation_fn",
+    [
+        geodesic_separation,
+        great_circle_separation,
+        vertical_separation,
+        euclidean_separation,
+    ],
+)
+def test_dtype(separation_fn):
+    """
+    Check that single precision separations are float32 and match double
+    precision to within a metre, up to near-antipodal pairs of aircraft.
+    """
+    from_ids = ["TST1001", "TST2002", "FAR", "ANTIPODE", "MISSING"]
+
+    separation = separation_fn(from_aircraft_id=from_ids, dtype=np.float32)
+    assert (separation.dtypes == np.float32).all()
+
+    expected = separation_fn(from_aircraft_id=from_ids)
+    assert (expected.dtypes == np.float64).all()
+    assert separation.to_numpy() == pytest.approx(
+        expected.to_numpy(), abs=1, nan_ok=True
+    )
+
+    near = separation_fn(from_aircraft_id=from_ids, dtype=np.float32, max_distance=1e6)
+    assert near["separation"].dtype == np.float32
+
+    for dtype in [np.int64, np.float16, None]:
+        with pytest.raises(AssertionError):
+            separation_fn(from_aircraft_id=from_ids, dtype=dtype)